@@ -10,31 +10,68 @@ PEP-723対応: uvx で実行可能
 """
 
 import argparse
+import concurrent.futures
 import dataclasses
+import functools
+import hashlib
+import heapq
 import json
 import os
+import random
 import re
+import sqlite3
 import sys
-import subprocess
-import tempfile
+import threading
+import time
 import uuid
+from array import array
 from pathlib import Path
 from typing import Any
 
+import httpx
 import yaml
+
+try:
+    # libyaml (C実装) が利用可能ならそちらを使う（純Python実装より5-10倍高速）
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    # orjson (C実装) が利用可能ならそちらでシリアライズする
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+
 from google import genai
 from google.genai.types import HarmCategory, HarmBlockThreshold
 import voyageai
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance,
     FieldCondition,
     Filter,
+    FilterSelector,
     MatchValue,
     PayloadSchemaType,
-    PointIdsList,
     PointStruct,
+    QuantizationSearchParams,
+    QueryRequest,
+    Range,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    TextIndexParams,
+    TextIndexType,
+    TokenizerType,
     VectorParams,
 )
 
@@ -42,7 +79,7 @@ from qdrant_client.models import (
 # ==================== 設定管理 ====================
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Config:
     """環境変数の一元管理クラス"""
 
@@ -86,10 +123,13 @@ class Config:
         )
     )
 
-    @property
-    def is_rag_enabled(self) -> bool:
-        """RAG機能が有効かどうか"""
-        return bool(self.qdrant_url and self.qdrant_api_key and self.voyage_api_key)
+    # RAG機能が有効かどうか（構築時に一度だけ判定）
+    is_rag_enabled: bool = dataclasses.field(init=False)
+
+    def __post_init__(self):
+        self.is_rag_enabled = bool(
+            self.qdrant_url and self.qdrant_api_key and self.voyage_api_key
+        )
 
     def validate_for_normal_mode(self):
         """通常モード実行時の必須環境変数チェック"""
@@ -115,34 +155,47 @@ class Config:
             raise ValueError("Error: QDRANT_API_KEY not set")
 
 
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """環境変数設定のシングルトンを取得
+
+    環境変数は実行中に変化しないため、プロセスごとに1回だけ構築する。
+    """
+    return Config()
+
+
 # 設定を読み込み
-config = Config()
+config = get_config()
 
 
 # ==================== ユーティリティ ====================
 
 
+@functools.lru_cache(maxsize=1)
 def find_repo_root() -> Path:
-    """リポジトリルートを探索
+    """リポジトリルートを探索（プロセス中は不変のためキャッシュ）
 
     Returns:
         Path: リポジトリルートディレクトリ
     """
     # カレントディレクトリから.gitディレクトリを探す
     # (uvx実行時は__file__がsite-packagesを指すため、cwdを起点とする)
+    # parentsのリスト化を避け、見つかった時点で打ち切る
     current = Path.cwd().resolve()
-    for parent in [current] + list(current.parents):
-        if (parent / ".git").exists():
-            return parent
-
-    # .git が見つからない場合はカレントディレクトリを返す
-    return current
+    path = current
+    while True:
+        if (path / ".git").exists():
+            return path
+        if path.parent == path:
+            # .git が見つからない場合はカレントディレクトリを返す
+            return current
+        path = path.parent
 
 
 # ==================== テンプレート設定 ====================
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class TemplateConfig:
     """テンプレート設定"""
 
@@ -150,15 +203,40 @@ class TemplateConfig:
     issue_template_file: str
     system_prompt: str
     keywords: list[str]
+    display_name: str = ""
 
+    # テンプレート判定用の要約（設定読み込み時に一度だけ計算）
+    system_prompt_summary: str = dataclasses.field(init=False)
+    keywords_top: list[str] = dataclasses.field(init=False)
 
-@dataclasses.dataclass
+    def __post_init__(self):
+        object.__setattr__(
+            self, "system_prompt_summary", (self.system_prompt or "").strip()[:300]
+        )
+        object.__setattr__(self, "keywords_top", (self.keywords or [])[:10])
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
 class ImproveIssueSettings:
     """Issue改善設定"""
 
     templates: dict[str, TemplateConfig]
     default_template: str
 
+    # テンプレート判定プロンプト用の候補一覧JSON（構築時に一度だけ生成）
+    template_summaries_json: str = dataclasses.field(init=False)
+
+    def __post_init__(self):
+        summaries: list[dict[str, Any]] = [
+            {
+                "name": name,
+                "keywords": tmpl.keywords_top,
+                "system_prompt": tmpl.system_prompt_summary,
+            }
+            for name, tmpl in self.templates.items()
+        ]
+        object.__setattr__(self, "template_summaries_json", _json_dumps(summaries))
+
     def validate(self):
         """設定の妥当性をチェック"""
         if not self.templates:
@@ -169,8 +247,9 @@ class ImproveIssueSettings:
             )
 
 
+@functools.lru_cache(maxsize=1)
 def load_settings() -> ImproveIssueSettings:
-    """設定ファイルを読み込む
+    """設定ファイルを読み込む（プロセス中は不変のためキャッシュ）
 
     Returns:
         ImproveIssueSettings: 設定オブジェクト
@@ -194,9 +273,9 @@ def load_settings() -> ImproveIssueSettings:
             f"リポジトリルートに .ai_improve_issue.yml を配置してください。"
         )
 
-    # YAML読み込み
-    with open(config_file, encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    # YAML読み込み（libyamlはバッファ一括渡しが最速のためバイナリで読み込む）
+    with open(config_file, "rb") as f:
+        data = yaml.load(f.read(), Loader=_YamlLoader)
 
     # バリデーション
     if not data:
@@ -226,6 +305,7 @@ def load_settings() -> ImproveIssueSettings:
             issue_template_file=tmpl_data["issue_template_file"],
             system_prompt=tmpl_data["system_prompt"],
             keywords=tmpl_data["keywords"],
+            display_name=tmpl_data.get("display_name", ""),
         )
 
     settings = ImproveIssueSettings(
@@ -243,9 +323,15 @@ def load_settings() -> ImproveIssueSettings:
 
 def load_template_content(template: TemplateConfig) -> str:
     """ISSUE_TEMPLATEファイルから実際のテンプレート内容を読み込む"""
+    return _load_template_content_cached(template.issue_template_file)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_template_content_cached(issue_template_file: str) -> str:
+    """テンプレートファイルの読み込み実体（ファイル名をキーにキャッシュ）"""
     repo_root = find_repo_root()
     template_file = (
-        repo_root / ".github" / "ISSUE_TEMPLATE" / f"{template.issue_template_file}.md"
+        repo_root / ".github" / "ISSUE_TEMPLATE" / f"{issue_template_file}.md"
     )
 
     if not template_file.exists():
@@ -257,16 +343,11 @@ def load_template_content(template: TemplateConfig) -> str:
         content = f.read()
 
     # frontmatter (---で囲まれた部分) を除去
-    lines = content.split("\n")
-    if lines and lines[0] == "---":
-        # 2つ目の---を探す
-        end_idx = None
-        for i in range(1, len(lines)):
-            if lines[i] == "---":
-                end_idx = i
-                break
-        if end_idx is not None:
-            content = "\n".join(lines[end_idx + 1 :])
+    # 行リストへの分割・再結合を避け、str.findによる1パス走査で切り出す
+    if content.startswith("---\n"):
+        end = content.find("\n---\n", 4)
+        if end != -1:
+            content = content[end + 5 :]
 
     return content.strip()
 
@@ -278,7 +359,7 @@ def get_improve_prompt(
     template_name: str,
     issue_body: str,
     issue_title: str = "",
-    similar_issues: list[dict[str, Any]] | None = None,
+    similar_issues: list["SimilarIssue"] | None = None,
     settings: ImproveIssueSettings | None = None,
 ) -> tuple[str, str]:
     """テンプレートに応じたプロンプトを取得（RAG対応）
@@ -316,20 +397,22 @@ def get_improve_prompt(
 {template_content}
 """
 
-    # RAG検索結果があれば追加
-    if similar_issues and len(similar_issues) > 0:
-        similar_info = (
-            "\n\n【類似する過去Issue】\n以下の過去Issueを参考にしてください：\n"
-        )
-        for i, issue in enumerate(similar_issues, 1):
-            similar_info += f"""
+    # RAG検索結果があれば追加（ループ内+=の再確保を避けてjoinで組み立てる）
+    if similar_issues:
+        parts = ["\n\n【類似する過去Issue】\n以下の過去Issueを参考にしてください：\n"]
+        parts.extend(
+            f"""
 【参考Issue {i}】
-- タイトル: {issue["issue_title"]}
-- 本文抜粋: {issue["issue_body"][:200]}...
-- 類似度: {issue["similarity"]:.1%}
+- タイトル: {issue.issue_title}
+- 本文抜粋: {issue.issue_body[:200]}...
+- 類似度: {issue.similarity:.1%}
 """
-        similar_info += "\n上記の参考Issueから、記述スタイルや必要な情報項目を学び、より具体的で実用的な例文を生成してください。"
-        prompt += similar_info
+            for i, issue in enumerate(similar_issues, 1)
+        )
+        parts.append(
+            "\n上記の参考Issueから、記述スタイルや必要な情報項目を学び、より具体的で実用的な例文を生成してください。"
+        )
+        prompt += "".join(parts)
 
     return system_instruction, prompt
 
@@ -386,21 +469,6 @@ class TextProcessAgent:
         Returns:
             テンプレート名（失敗時や曖昧時は `default_template`）
         """
-        # テンプレート情報を要約してLLMに渡す
-        tmpl_summaries: list[dict[str, Any]] = []
-        for name, tmpl in settings.templates.items():
-            sp = (tmpl.system_prompt or "").strip()
-            if len(sp) > 300:
-                sp = sp[:300]
-            kws = (tmpl.keywords or [])[:10]
-            tmpl_summaries.append(
-                {
-                    "name": name,
-                    "keywords": kws,
-                    "system_prompt": sp,
-                }
-            )
-
         system_instruction = (
             "あなたはIssueの内容から最適なテンプレートを1つだけ選ぶ分類器です。\n"
             "提供されたテンプレート候補の中から、記述の目的・構造に最も適合するものを厳密に1件選んでください。\n"
@@ -412,7 +480,7 @@ class TextProcessAgent:
             f"タイトル: {issue_title}\n"
             f"本文: {issue_body}\n\n"
             "【テンプレート候補一覧(JSON)】\n"
-            f"{json.dumps(tmpl_summaries, ensure_ascii=False)}\n\n"
+            f"{settings.template_summaries_json}\n\n"
             "以下の形式で厳密に1件のみ出力してください。\n"
             '{"template": "<name>"}'
         )
@@ -497,20 +565,146 @@ class TextProcessAgent:
         return "⚠️ AIによる生成に失敗しました。手動で記入してください。"
 
 
+@functools.lru_cache(maxsize=4)
+def get_text_process_agent(
+    llm_api_key: str, model: str = "gemini-2.5-flash"
+) -> TextProcessAgent:
+    """TextProcessAgentを取得（同一キー・モデルでは再利用）
+
+    バッチ実行時にIssueごとクライアントを再構築しないようキャッシュする。
+    """
+    return TextProcessAgent(llm_api_key=llm_api_key, model=model)
+
+
 # ==================== RAGクライアント (Phase 2) ====================
 
 
+@functools.lru_cache(maxsize=8)
+def _get_voyage_client(api_key: str) -> voyageai.Client:
+    """voyageai.Clientを接続先ごとに使い回す
+
+    ワークフロー中に複数回クライアントを構築してもHTTPコネクション
+    プールを共有できるようにする。
+    """
+    return voyageai.Client(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_qdrant_client(url: str, api_key: str) -> QdrantClient:
+    """QdrantClientを接続先ごとに使い回す
+
+    gRPCチャネルの再確立（TLSハンドシェイク含む）を避けるため、
+    同一の(url, api_key)では単一のクライアントを共有する。
+    """
+    # gRPC優先: HTTP/2の単一コネクション上でprotobufを多重化し、
+    # 一括upsert・検索時のリクエストあたりオーバーヘッドを削減する
+    return QdrantClient(url=url, api_key=api_key, prefer_grpc=True, timeout=60)
+
+
 class VoyageEmbeddingClient:
     """Voyage AI Embeddingクライアント"""
 
-    def __init__(self, api_key: str, model: str = "voyage-3.5-lite"):
+    # 1リクエストで送るテキスト数の上限（Voyage APIは1000件/リクエストまで）
+    SUB_BATCH_SIZE = 128
+
+    # 同時に投げるリクエスト数（ネットワーク待ちの隠蔽用）
+    MAX_CONCURRENCY = 5
+
+    # レート制限時のリトライ回数
+    MAX_RETRIES = 3
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "voyage-3.5-lite",
+        cache_path: Path | None = None,
+    ):
         """
         Args:
             api_key: Voyage AI APIキー
             model: モデル名（デフォルト: voyage-3.5-lite）
+            cache_path: Embeddingキャッシュのパス（Noneなら既定の場所）
         """
-        self.client = voyageai.Client(api_key=api_key)
+        self.client = _get_voyage_client(api_key)
         self.model = model
+        self._cache_lock = threading.Lock()
+        self._cache = self._open_cache(cache_path)
+
+    @staticmethod
+    def _open_cache(cache_path: Path | None) -> sqlite3.Connection:
+        """Embeddingキャッシュ用のSQLite DBを開く
+
+        同一テキストの再Embeddingを実行間でスキップするための
+        永続キャッシュ。パスは環境変数 AI_IMPROVE_ISSUE_EMBED_CACHE
+        で上書きできる。
+        """
+        if cache_path is None:
+            env_path = os.environ.get("AI_IMPROVE_ISSUE_EMBED_CACHE")
+            if env_path:
+                cache_path = Path(env_path)
+            else:
+                cache_path = (
+                    Path.home() / ".cache" / "ai-improve-issue" / "embeddings.sqlite3"
+                )
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cache_path, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings"
+            " (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    def _cache_key(self, text: str, dimensions: int) -> str:
+        """モデル・次元数・テキスト内容から内容アドレスのキーを生成"""
+        payload = f"{self.model}|{dimensions}|{text}".encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _cache_get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """キャッシュ済みEmbeddingをまとめて取得"""
+        found: dict[str, list[float]] = {}
+        with self._cache_lock:
+            # SQLiteのバインド変数上限を超えないよう分割して問い合わせる
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._cache.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = list(array("f", blob))
+        return found
+
+    def _cache_set_many(self, items: dict[str, list[float]]):
+        """Embeddingをまとめてキャッシュに保存（float32のバイト列で格納）"""
+        if not items:
+            return
+        with self._cache_lock:
+            self._cache.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("f", vector).tobytes()) for key, vector in items.items()],
+            )
+            self._cache.commit()
+
+    def _embed_with_retry(self, texts: list[str], dimensions: int) -> list[list[float]]:
+        """Embedding APIを呼び出す（429は指数バックオフ+ジッタでリトライ）"""
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                result = self.client.embed(
+                    texts=texts, model=self.model, output_dimension=dimensions
+                )
+                return result.embeddings
+            except voyageai.error.RateLimitError:
+                wait = 2**attempt + random.random()
+                print(f"Rate limited by Voyage API. Retrying in {wait:.1f}s...")
+                time.sleep(wait)
+
+        result = self.client.embed(
+            texts=texts, model=self.model, output_dimension=dimensions
+        )
+        return result.embeddings
 
     def generate_embedding(self, text: str, dimensions: int = 256) -> list[float]:
         """テキストのEmbeddingを生成
@@ -522,15 +716,101 @@ class VoyageEmbeddingClient:
         Returns:
             Embeddingベクトル
         """
-        result = self.client.embed(
-            texts=[text], model=self.model, output_dimension=dimensions
-        )
-        return result.embeddings[0]
+        return self.generate_embeddings_batch([text], dimensions)[0]
+
+    def generate_embeddings_batch(
+        self, texts: list[str], dimensions: int = 256
+    ) -> list[list[float]]:
+        """テキストリストのEmbeddingを一括生成
+
+        永続キャッシュに存在するテキストはAPI呼び出しをスキップし、
+        未キャッシュ分のみ_embed_manyでAPIへ送信する。
+        結果は入力順を保って返す。
+
+        Args:
+            texts: 入力テキストリスト
+            dimensions: 出力次元数（256, 512, 1024）
+
+        Returns:
+            Embeddingベクトルリスト（textsと同順）
+        """
+        if not texts:
+            return []
+
+        keys = [self._cache_key(text, dimensions) for text in texts]
+        cached = self._cache_get_many(keys)
+
+        miss_indexes = [i for i, key in enumerate(keys) if key not in cached]
+        if miss_indexes:
+            miss_vectors = self._embed_many(
+                [texts[i] for i in miss_indexes], dimensions
+            )
+            new_items = {
+                keys[i]: vector for i, vector in zip(miss_indexes, miss_vectors)
+            }
+            self._cache_set_many(new_items)
+            cached.update(new_items)
+
+        return [cached[key] for key in keys]
+
+    def _embed_many(self, texts: list[str], dimensions: int) -> list[list[float]]:
+        """未キャッシュのテキストをサブバッチに分割して並行Embedding"""
+        batches = [
+            texts[i : i + self.SUB_BATCH_SIZE]
+            for i in range(0, len(texts), self.SUB_BATCH_SIZE)
+        ]
+        if len(batches) == 1:
+            return self._embed_with_retry(batches[0], dimensions)
+
+        # executor.mapは入力順に結果を返すため並び順が保たれる
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self.MAX_CONCURRENCY, len(batches))
+        ) as executor:
+            return [
+                vector
+                for batch_vectors in executor.map(
+                    lambda batch: self._embed_with_retry(batch, dimensions), batches
+                )
+                for vector in batch_vectors
+            ]
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class SimilarIssue:
+    """類似Issue検索結果"""
+
+    issue_number: int
+    issue_title: str
+    issue_body: str
+    state: str
+    url: str
+    similarity: float
+
+
+@dataclasses.dataclass(slots=True)
+class IssueUpsert:
+    """一括登録用のIssueチャンク情報"""
+
+    issue_number: int
+    chunks: list[str]
+    vectors: list[list[float]]
+    title: str
+    state: str
+    url: str
+    labels: list[str]
 
 
 class QdrantSearchClient:
     """Qdrant検索クライアント"""
 
+    # 1回のupsertリクエストで送るポイント数の上限
+    UPSERT_BATCH_SIZE = 256
+
+    # int8量子化ベクトルでの検索設定（元ベクトルでのリスコアリング付き）
+    _SEARCH_PARAMS = SearchParams(
+        quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+    )
+
     def __init__(
         self, url: str, api_key: str, collection_name: str = "ai-improve-issues"
     ):
@@ -541,17 +821,32 @@ class QdrantSearchClient:
             api_key: Qdrant APIキー
             collection_name: コレクション名（環境変数で上書き可能）
         """
-        self.client = QdrantClient(url=url, api_key=api_key)
+        self.client = _get_qdrant_client(url, api_key)
         self.collection_name = collection_name
+        self._collection_ready = False
 
     def ensure_collection(self, vector_size: int = 256):
-        """コレクションが存在することを確認、なければ作成"""
+        """コレクションが存在することを確認、なければ作成
+
+        確認結果はインスタンス内にキャッシュし、2回目以降の呼び出しでは
+        Qdrantへの問い合わせを行わない。
+        """
+        if self._collection_ready:
+            return
+
         collections = self.client.get_collections().collections
         collection_names = [col.name for col in collections]
         if self.collection_name not in collection_names:
             self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+                # int8スカラー量子化でメモリ使用量を1/4に削減
+                # （検索時は量子化ベクトルで絞り込み、元ベクトルでリスコア）
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8, always_ram=True
+                    )
+                ),
             )
             print(f"Collection '{self.collection_name}' created")
             self.client.create_payload_index(
@@ -559,13 +854,42 @@ class QdrantSearchClient:
                 field_name="issue_number",
                 field_schema=PayloadSchemaType.INTEGER,
             )
+            # 末尾チャンク削除のrange条件をインデックス参照にするため
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="chunk_index",
+                field_schema=PayloadSchemaType.INTEGER,
+            )
+            # 将来のフィルタ条件がフルスキャンに落ちないよう事前作成しておく
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="labels",
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="state",
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
+            # 日本語タイトルの全文フィルタ用（multilingualトークナイザ）
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="issue_title",
+                field_schema=TextIndexParams(
+                    type=TextIndexType.TEXT,
+                    tokenizer=TokenizerType.MULTILINGUAL,
+                    min_token_len=2,
+                ),
+            )
+
+        self._collection_ready = True
 
     def search_similar_issues(
         self,
         query_vector: list[float],
         limit: int = 3,
         exclude_issue_number: int | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> list[SimilarIssue]:
         """類似Issue検索（チャンク対応）
 
         Args:
@@ -580,44 +904,202 @@ class QdrantSearchClient:
             collection_name=self.collection_name,
             query=query_vector,
             limit=limit * 5,  # 余裕を持って取得
+            search_params=self._SEARCH_PARAMS,
+        )
+
+        return self._aggregate_similar_issues(
+            response.points, limit, exclude_issue_number
         )
 
-        points = getattr(response, "points", [])
+    def search_similar_issues_batch(
+        self,
+        query_vectors: list[list[float]],
+        limit: int = 3,
+        exclude_issue_number: int | None = None,
+    ) -> list[list[SimilarIssue]]:
+        """複数クエリベクトルの類似Issue検索を1リクエストにまとめて実行
+
+        クエリごとにquery_pointsを発行する代わりにquery_batch_pointsで
+        まとめて送信し、サーバー側で並列実行させる。
+
+        Args:
+            query_vectors: クエリベクトルのリスト
+            limit: クエリごとの取得件数（Top-K）
+            exclude_issue_number: 除外するIssue番号
+
+        Returns:
+            クエリごとの類似Issue情報リスト（query_vectorsと同順）
+        """
+        if not query_vectors:
+            return []
+
+        responses = self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                QueryRequest(
+                    query=vector,
+                    limit=limit * 5,
+                    with_payload=True,
+                    params=self._SEARCH_PARAMS,
+                )
+                for vector in query_vectors
+            ],
+        )
+        return [
+            self._aggregate_similar_issues(response.points, limit, exclude_issue_number)
+            for response in responses
+        ]
+
+    def search_similar_issues_rerank(
+        self,
+        query_vector: list[float],
+        limit: int = 3,
+        candidate_multiplier: int = 5,
+        exclude_issue_number: int | None = None,
+    ) -> list[SimilarIssue]:
+        """候補をローカルで再スコアリングする類似Issue検索
+
+        量子化ベクトルで絞り込んだ候補の元ベクトルを取り寄せ、
+        クエリとの内積をクライアント側で計算し直して順位付けする。
+        スコア式を変えたい場合（タイトル重み付けなど）にサーバー側の
+        再検索なしで差し替えられる拡張点。
+
+        Args:
+            query_vector: クエリベクトル
+            limit: 取得件数（Top-K）- Issue数（チャンク数ではない）
+            candidate_multiplier: limitに対する候補取得倍率
+            exclude_issue_number: 除外するIssue番号
+
+        Returns:
+            類似Issue情報のリスト
+        """
+        response = self.client.query_points(
+            collection_name=self.collection_name,
+            query=query_vector,
+            limit=limit * candidate_multiplier,
+            with_payload=True,
+            with_vectors=True,
+            search_params=self._SEARCH_PARAMS,
+        )
+        points = response.points
+
+        # 候補は高々limit*candidate_multiplier件（既定15件）なので
+        # 純Pythonの内積で再計算する（集約は既存パスを共用）
+        for result in points:
+            if result.vector is not None:
+                result.score = sum(q * v for q, v in zip(query_vector, result.vector))
+
+        return self._aggregate_similar_issues(points, limit, exclude_issue_number)
+
+    def _aggregate_similar_issues(
+        self,
+        points: list,
+        limit: int,
+        exclude_issue_number: int | None,
+    ) -> list[SimilarIssue]:
+        """チャンク検索結果をIssue単位に集約して上位limit件を返す"""
         if not points:
             return []
 
-        # Issueごとに最高スコアのチャンクを集約
-        issue_map = {}
+        # 第1パス: Issueごとに最高スコアの(score, payload)のみ保持する
+        # （落選する候補のために結果辞書を組み立てない）
+        best: dict[int, tuple[float, dict]] = {}
         for result in points:
-            issue_num = result.payload.get("issue_number")
+            payload = result.payload
+            issue_num = payload.get("issue_number")
             # 除外対象のIssue番号をスキップ
             if exclude_issue_number is not None and issue_num == exclude_issue_number:
                 continue
-            if (
-                issue_num not in issue_map
-                or result.score > issue_map[issue_num]["similarity"]
-            ):
-                # チャンクまたは全文を取得
-                issue_body = result.payload.get(
-                    "issue_body_chunk"
-                ) or result.payload.get("issue_body", "")
-
-                issue_map[issue_num] = {
-                    "issue_number": issue_num,
-                    "issue_title": result.payload.get("issue_title", ""),
-                    "issue_body": issue_body[:500],
-                    "state": result.payload.get("state", ""),
-                    "url": result.payload.get("url", ""),
-                    "similarity": result.score,
-                }
-
-        # スコア順でソートして上位limit件を返す
-        similar_issues = sorted(
-            issue_map.values(), key=lambda x: x["similarity"], reverse=True
-        )[:limit]
+            entry = best.get(issue_num)
+            if entry is None or result.score > entry[0]:
+                best[issue_num] = (result.score, payload)
+
+        # スコア順で上位limit件に絞ってから結果を構築する
+        # （全件ソートのO(n log n)ではなくO(n log k)で済むnlargestを使う）
+        top = heapq.nlargest(limit, best.items(), key=lambda kv: kv[1][0])
+
+        similar_issues = []
+        for issue_num, (score, payload) in top:
+            # チャンクはchunk_size以下で登録済みのため切り詰め不要
+            # 旧形式の全文ペイロードのみ500文字に切り詰める
+            issue_body = payload.get("issue_body_chunk")
+            if not issue_body:
+                issue_body = payload.get("issue_body", "")[:500]
+            similar_issues.append(
+                SimilarIssue(
+                    issue_number=issue_num,
+                    issue_title=payload.get("issue_title", ""),
+                    issue_body=issue_body,
+                    state=payload.get("state", ""),
+                    url=payload.get("url", ""),
+                    similarity=score,
+                )
+            )
 
         return similar_issues
 
+    def _delete_stale_chunks(self, issue_number: int, new_chunk_count: int):
+        """新しいチャンク数を超える古いチャンクのみ削除
+
+        ポイントIDは(issue_number, chunk_index)から決定的に生成されるため、
+        既存のチャンクはupsertでそのまま上書きされる。削除が必要なのは
+        チャンク数が減った場合に末尾へ残る古いポイントだけになる。
+        """
+        self._delete_points(
+            Filter(
+                must=[
+                    FieldCondition(
+                        key="issue_number",
+                        match=MatchValue(value=issue_number),
+                    ),
+                    FieldCondition(
+                        key="chunk_index",
+                        range=Range(gte=new_chunk_count),
+                    ),
+                ]
+            )
+        )
+
+    def _delete_points(self, points_filter: Filter):
+        """フィルタに一致する既存ポイントを削除
+
+        Qdrantのdeleteはフィルタを直接受け取れるため、scrollによる
+        id収集を挟まず1回のRPCで削除する。issue_numberには
+        ensure_collectionでペイロードインデックスを作成済みのため、
+        フィルタ評価はインデックス参照で行われる。
+        """
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=points_filter),
+            wait=False,
+        )
+
+    def _build_points(self, item: IssueUpsert) -> list[PointStruct]:
+        """IssueチャンクからPointStructリストを構築"""
+        points = []
+        for i, (chunk, vector) in enumerate(zip(item.chunks, item.vectors)):
+            # (コレクション, Issue番号, チャンクindex)から決定的にIDを生成し、
+            # 再インデックス時は同一ポイントをupsertで上書きする
+            point_id = uuid.uuid5(
+                uuid.NAMESPACE_URL,
+                f"{self.collection_name}/{item.issue_number}/{i}",
+            )
+            point = PointStruct(
+                id=str(point_id),
+                vector=vector,
+                payload={
+                    "issue_number": item.issue_number,
+                    "chunk_index": i,
+                    "issue_title": item.title,
+                    "issue_body_chunk": chunk,
+                    "state": item.state,
+                    "url": item.url,
+                    "labels": item.labels,
+                },
+            )
+            points.append(point)
+        return points
+
     def upsert_issue_chunks(
         self,
         issue_number: int,
@@ -639,93 +1121,90 @@ class QdrantSearchClient:
             url: IssueのURL
             labels: ラベルリスト
         """
-        # 既存のチャンクを削除（issue_numberで始まるIDを検索して削除）
-        ids_to_delete: list[str] = []
-        offset: dict | None = None
-        while True:
-            existing_points, next_offset = self.client.scroll(
-                collection_name=self.collection_name,
-                scroll_filter=Filter(
-                    must=[
-                        FieldCondition(
-                            key="issue_number",
-                            match=MatchValue(value=issue_number),
-                        )
-                    ]
-                ),
-                limit=256,
-                offset=offset,
-                with_payload=False,
-                with_vectors=False,
-            )
+        self._delete_stale_chunks(issue_number, len(chunks))
 
-            if not existing_points:
-                break
+        points = self._build_points(
+            IssueUpsert(issue_number, chunks, vectors, title, state, url, labels)
+        )
+        self.client.upsert(collection_name=self.collection_name, points=points)
+        print(f"Issue #{issue_number} indexed with {len(chunks)} chunks")
 
-            ids_to_delete.extend(str(point.id) for point in existing_points)
+    def upsert_issue_chunks_bulk(self, items: list[IssueUpsert]):
+        """複数Issueのチャンクをまとめて登録または更新
 
-            if next_offset is None:
-                break
+        Issueごとに1リクエストを発行する代わりに、ポイントを
+        UPSERT_BATCH_SIZE件まで蓄積して1回のupsertで送信する。
 
-            offset = next_offset
+        Args:
+            items: 登録するIssueチャンク情報のリスト
+        """
+        # wait=Falseでパイプライン化し、Qdrant側の書き込みバッチングに任せる
+        pending: list[PointStruct] = []
+        for item in items:
+            # 決定的IDにより同一チャンクは上書きされるため、
+            # チャンク数が減った場合の末尾の残骸のみ削除する
+            self._delete_stale_chunks(item.issue_number, len(item.chunks))
+            pending.extend(self._build_points(item))
+            if len(pending) >= self.UPSERT_BATCH_SIZE:
+                self.client.upsert(
+                    collection_name=self.collection_name, points=pending, wait=False
+                )
+                pending = []
 
-        if ids_to_delete:
-            self.client.delete(
-                collection_name=self.collection_name,
-                points_selector=PointIdsList(points=ids_to_delete),
+        if pending:
+            self.client.upsert(
+                collection_name=self.collection_name, points=pending, wait=False
             )
 
-        # 新しいチャンクを登録
-        points = []
-        for i, (chunk, vector) in enumerate(zip(chunks, vectors)):
-            point = PointStruct(
-                id=str(uuid.uuid4()),
-                vector=vector,
-                payload={
-                    "issue_number": issue_number,
-                    "chunk_index": i,
-                    "issue_title": title,
-                    "issue_body_chunk": chunk,
-                    "state": state,
-                    "url": url,
-                    "labels": labels,
-                },
-            )
-            points.append(point)
-
-        self.client.upsert(collection_name=self.collection_name, points=points)
-        print(f"Issue #{issue_number} indexed with {len(chunks)} chunks")
+        total_chunks = sum(len(item.chunks) for item in items)
+        print(f"{len(items)} issues indexed with {total_chunks} chunks")
 
 
 # ==================== GitHub API ====================
 
 
-def fetch_issue_from_github(issue_number: int) -> dict | None:
-    """GitHub APIからIssue情報を取得
+class _RateLimiter:
+    """リクエスト間隔を一定以上に保つ簡易レートリミッタ（スレッドセーフ）"""
 
-    Args:
-        issue_number: Issue番号
+    def __init__(self, requests_per_sec: float):
+        self._interval = 1.0 / requests_per_sec
+        self._lock = threading.Lock()
+        self._next_time = 0.0
 
-    Returns:
-        Issue情報の辞書、取得失敗時はNone
-    """
-    if not config.github_repository:
-        print("Error: GITHUB_REPOSITORY not set")
-        return None
+    def acquire(self):
+        """必要なら待機してリクエスト枠を1つ取得"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(self._next_time, now) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# 並行フェッチ時にGitHubのセカンダリレート制限を踏まないよう10req/sに抑える
+_github_rate_limiter = _RateLimiter(10.0)
 
-    cmd = ["gh", "api", f"/repos/{config.github_repository}/issues/{issue_number}"]
 
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        check=True,
-        env={
-            "GH_TOKEN": config.github_token,
-            "GH_REPO": config.github_repository,
+@functools.lru_cache(maxsize=1)
+def _github_client() -> httpx.Client:
+    """GitHub API用の永続HTTPクライアントを取得
+
+    ghサブプロセスの起動コストとリクエストごとのTLSハンドシェイクを
+    避けるため、HTTP/2の単一コネクションを全リクエストで使い回す。
+    """
+    return httpx.Client(
+        base_url="https://api.github.com",
+        http2=True,
+        headers={
+            "Authorization": f"Bearer {config.github_token}",
+            "Accept": "application/vnd.github+json",
         },
+        timeout=30,
     )
-    issue_data = json.loads(result.stdout)
+
+
+def _issue_to_dict(issue_data: dict) -> dict:
+    """GitHub APIのIssueレスポンスを内部形式の辞書に変換"""
     labels = [label["name"] for label in issue_data["labels"]]
     return {
         "number": int(issue_data["number"]),
@@ -737,6 +1216,27 @@ def fetch_issue_from_github(issue_number: int) -> dict | None:
     }
 
 
+def fetch_issue_from_github(issue_number: int) -> dict | None:
+    """GitHub APIからIssue情報を取得
+
+    Args:
+        issue_number: Issue番号
+
+    Returns:
+        Issue情報の辞書、取得失敗時はNone
+    """
+    if not config.github_repository:
+        print("Error: GITHUB_REPOSITORY not set")
+        return None
+
+    _github_rate_limiter.acquire()
+    response = _github_client().get(
+        f"/repos/{config.github_repository}/issues/{issue_number}"
+    )
+    response.raise_for_status()
+    return _issue_to_dict(response.json())
+
+
 def fetch_all_issues(start: int = 1, end: int | None = None) -> list[dict]:
     """全Issue情報を取得
 
@@ -751,55 +1251,128 @@ def fetch_all_issues(start: int = 1, end: int | None = None) -> list[dict]:
         print("Error: GITHUB_REPOSITORY not set")
         return []
 
-    # gh issue list でIssue番号一覧を取得
-    cmd = [
-        "gh",
-        "issue",
-        "list",
-        "--state",
-        "all",
-        "--limit",
-        "1000",
-        "--json",
-        "number",
-    ]
-
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        check=True,
-        cwd=os.getcwd(),
-        env={
-            "GH_TOKEN": config.github_token,
-            "GH_REPO": config.github_repository,
-        },
-    )
-    issues_data = json.loads(result.stdout)
-    issue_numbers = [issue["number"] for issue in issues_data]
-
-    # 範囲フィルタリング
-    if end is not None:
-        issue_numbers = [n for n in issue_numbers if start <= n <= end]
-    else:
-        issue_numbers = [n for n in issue_numbers if n >= start]
-
-    # 各Issueの詳細を取得
+    # Issue一覧をページネーションで取得
+    # 一覧レスポンスに本文・ラベル等が含まれるため、Issueごとの詳細取得は不要
     issues = []
-    for num in issue_numbers:
-        issue = fetch_issue_from_github(num)
-        if issue:
-            issues.append(issue)
+    page = 1
+    while True:
+        _github_rate_limiter.acquire()
+        response = _github_client().get(
+            f"/repos/{config.github_repository}/issues",
+            params={"state": "all", "per_page": 100, "page": page},
+        )
+        response.raise_for_status()
+        issues_data = response.json()
+        if not issues_data:
+            break
+
+        for issue_data in issues_data:
+            # Pull RequestはIssue一覧に含まれるため除外
+            if "pull_request" in issue_data:
+                continue
+            number = int(issue_data["number"])
+            # 範囲フィルタリング
+            if number < start or (end is not None and number > end):
+                continue
+            issues.append(_issue_to_dict(issue_data))
+
+        if len(issues_data) < 100:
+            break
+        page += 1
 
     return issues
 
 
 # ==================== チャンク処理 ====================
 
+# チャンク分割の区切り文字（日本語優先の優先順）
+_CHUNK_SEPARATORS = ["。", "\n\n", "\n", " "]
+
+
+def _split_text(text: str, chunk_size: int = 400, overlap: int = 50) -> list[str]:
+    """テキストをchunk_size以下のチャンクに分割
+
+    各ウィンドウ内で最も優先度の高い区切り文字の最後の出現位置で切り、
+    見つからなければchunk_sizeで打ち切る。次のチャンクはoverlap文字
+    さかのぼった位置から始める。
+
+    Args:
+        text: 入力テキスト
+        chunk_size: チャンクの最大文字数
+        overlap: チャンク間で重複させる文字数
+
+    Returns:
+        チャンクリスト
+    """
+    if len(text) <= chunk_size:
+        return [text]
+
+    chunks = []
+    start = 0
+    prev_cut = 0
+    n = len(text)
+    while start < n:
+        end = min(start + chunk_size, n)
+        cut = n
+        if end < n:
+            cut = end
+            # 直前の切断位置より後ろだけを探索し、前チャンクに完全に
+            # 含まれるチャンク（overlap領域内での切断）を作らない
+            for sep in _CHUNK_SEPARATORS:
+                pos = text.rfind(sep, prev_cut + 1, end)
+                if pos != -1:
+                    cut = pos + len(sep)
+                    break
+        chunks.append(text[start:cut])
+        if cut >= n:
+            break
+        start = max(cut - overlap, start + 1)
+        prev_cut = cut
+
+    return chunks
+
+
+def _merge_tiny_chunks(
+    chunks: list[str], min_size: int = 100, max_size: int = 450, overlap: int = 50
+) -> list[str]:
+    """極小チャンクを直前のチャンクに統合
+
+    分割境界付近に生じる文脈の乏しい短いチャンク（min_size未満）を、
+    max_sizeを超えない範囲で直前のチャンクへ連結する。チャンク数が
+    減るぶんEmbedding対象のトークン数とQdrantのポイント数も減る。
+
+    Args:
+        chunks: チャンクリスト
+        min_size: これ未満のチャンクを統合対象とする文字数
+        max_size: 統合後のチャンクの最大文字数
+        overlap: 分割時にチャンク間で重複させた文字数
+
+    Returns:
+        統合後のチャンクリスト
+    """
+    merged: list[str] = []
+    for chunk in chunks:
+        if merged and len(chunk) < min_size:
+            prev = merged[-1]
+            # 分割時のoverlapにより先頭が直前チャンクの末尾と重複して
+            # いるため、共有部分を取り除いてから連結する
+            k = min(overlap, len(chunk), len(prev))
+            while k > 0 and not prev.endswith(chunk[:k]):
+                k -= 1
+            tail = chunk[k:]
+            if len(prev) + len(tail) <= max_size:
+                merged[-1] = prev + tail
+                continue
+        merged.append(chunk)
+    return merged
+
 
 def create_issue_chunks(issue_title: str, issue_body: str) -> list[str]:
     """Issue本文をチャンク分割
 
+    分割後、境界付近の極小チャンクは直前のチャンクへ統合する
+    （2パスのsplit-then-merge）。
+
     Args:
         issue_title: Issueタイトル
         issue_body: Issue本文
@@ -809,20 +1382,8 @@ def create_issue_chunks(issue_title: str, issue_body: str) -> list[str]:
     """
     # タイトルと本文を結合
     full_text = f"{issue_title}\n\n{issue_body}"
-
-    # 短い場合はチャンク分割不要
-    if len(full_text) <= 400:
-        return [full_text]
-
-    # LangChainのRecursiveCharacterTextSplitterを使用
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=400,
-        chunk_overlap=50,
-        separators=["。", "\n\n", "\n", " ", ""],  # 日本語優先の区切り文字
-    )
-
-    chunks = splitter.split_text(full_text)
-    return chunks
+    chunks = _split_text(full_text, chunk_size=400, overlap=50)
+    return _merge_tiny_chunks(chunks)
 
 
 def create_embeddings_for_chunks(
@@ -838,16 +1399,24 @@ def create_embeddings_for_chunks(
     Returns:
         Embeddingベクトルリスト
     """
-    # Batch embed all chunks at once
-    result = embedding_client.client.embed(
-        texts=chunks, model=embedding_client.model, output_dimension=dimensions
-    )
-    return result.embeddings
+    return embedding_client.generate_embeddings_batch(chunks, dimensions=dimensions)
 
 
 # ==================== メイン処理 ====================
 
 
+def _has_min_nonspace(*parts: str, n: int = 10) -> bool:
+    """非空白文字がn文字以上あるか（閾値到達時点で打ち切り）"""
+    count = 0
+    for part in parts:
+        for ch in part or "":
+            if ch not in " \n\t":
+                count += 1
+                if count >= n:
+                    return True
+    return False
+
+
 def check_needs_improvement(issue_body: str, issue_title: str) -> bool:
     """Issue改善が必要かチェック
 
@@ -858,33 +1427,23 @@ def check_needs_improvement(issue_body: str, issue_title: str) -> bool:
     Returns:
         True: 改善が必要, False: 改善不要
     """
-    # タイトルと本文を結合し、空白を除去して文字数をカウント
-    combined = (issue_title or "") + (issue_body or "")
-    text_without_spaces = combined.replace(" ", "").replace("\n", "").replace("\t", "")
-
-    # 10文字未満の場合は改善不要
-    if len(text_without_spaces) < 10:
-        return False
-
-    return True
+    # 非空白10文字未満の場合は改善不要
+    return _has_min_nonspace(issue_title, issue_body)
 
 
-def post_comment_via_gh(issue_number: str, content: str) -> None:
-    """GitHub CLI経由でコメントを投稿
+def post_comment(issue_number: str, content: str) -> None:
+    """GitHub APIでコメントを投稿
 
     Args:
         issue_number: Issue番号
         content: コメント内容
     """
-    # 一時ファイルに本文を書き出し
-    with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", suffix=".md") as f:
-        f.write(content)
-        f.flush()
-        # GitHub CLIでコメント投稿
-        subprocess.run(
-            ["gh", "issue", "comment", issue_number, "--body-file", f.name],
-            check=True,
-        )
+    _github_rate_limiter.acquire()
+    response = _github_client().post(
+        f"/repos/{config.github_repository}/issues/{issue_number}/comments",
+        json={"body": content},
+    )
+    response.raise_for_status()
     print(f"Comment posted successfully to issue #{issue_number}")
 
 
@@ -892,7 +1451,7 @@ def generate_improved_content(
     issue_body: str,
     issue_title: str,
     llm_api_key: str,
-    similar_issues: list[dict[str, Any]] | None = None,
+    similar_issues: list[SimilarIssue] | None = None,
     settings: ImproveIssueSettings | None = None,
 ) -> tuple[str, str]:
     """Issue内容を改善した例文を生成（RAG対応）
@@ -910,8 +1469,8 @@ def generate_improved_content(
     if settings is None:
         raise ValueError("settings is required")
 
-    # LLMクライアント初期化
-    client = TextProcessAgent(llm_api_key=llm_api_key)
+    # LLMクライアント初期化（キャッシュ済みインスタンスを再利用）
+    client = get_text_process_agent(llm_api_key)
 
     # テンプレート判定
     template_name = client.detect_template(issue_body, issue_title, settings)
@@ -930,7 +1489,8 @@ def generate_improved_content(
 def format_comment(
     improved_content: str,
     template_name: str,
-    similar_issues: list[dict[str, Any]] | None = None,
+    similar_issues: list[SimilarIssue] | None = None,
+    settings: ImproveIssueSettings | None = None,
 ) -> str:
     """コメント用のフォーマット済み文字列を生成（RAG対応）
 
@@ -938,17 +1498,20 @@ def format_comment(
         improved_content: 改善された内容
         template_name: テンプレート名
         similar_issues: 類似Issue情報（RAG検索結果）
+        settings: 設定オブジェクト
 
     Returns:
         フォーマット済みのコメント文字列
     """
-    template_display_names = {
-        "feature_request": "機能要件",
-        "bug_report": "バグ報告",
-    }
-    template_display = template_display_names.get(template_name, template_name)
+    if settings is None:
+        raise ValueError("settings is required")
 
-    comment = f"""## 🤖 AIによるIssue記入例
+    tmpl = settings.templates.get(template_name)
+    template_display = (tmpl.display_name if tmpl else "") or template_name
+
+    # 文字列の逐次連結（再確保の繰り返し）を避け、パーツをリストに集めて最後にjoinする
+    parts = [
+        f"""## 🤖 AIによるIssue記入例
 
 **選定テンプレート**: {template_display}
 
@@ -958,27 +1521,33 @@ def format_comment(
 
 ---
 """
+    ]
 
     # RAG検索結果があれば追加
-    if similar_issues and len(similar_issues) > 0:
-        comment += "\n### 📚 参考にした類似Issue\n\nこの例文は以下の過去Issueを参考に生成しています：\n\n"
+    if similar_issues:
+        parts.append(
+            "\n### 📚 参考にした類似Issue\n\nこの例文は以下の過去Issueを参考に生成しています：\n\n"
+        )
         for i, issue in enumerate(similar_issues, 1):
-            comment += f"""{i}. **#{issue["issue_number"]}: {issue["issue_title"]}** ({issue["state"]})
-   - 類似度: {issue["similarity"]:.0%}
-   - {issue["url"]}
+            parts.append(
+                f"""{i}. **#{issue.issue_number}: {issue.issue_title}** ({issue.state})
+   - 類似度: {issue.similarity:.0%}
+   - {issue.url}
 
 """
-        comment += "---\n\n"
+            )
+        parts.append("---\n\n")
 
-    comment += """💡 **使い方**: 上記の例文を参考に、Issue本文を編集してください。"""
-    if similar_issues and len(similar_issues) > 0:
-        comment += "類似Issueも確認すると、より詳細な情報が得られます。"
-    else:
-        comment += "実際のプロジェクトに合わせて内容を修正してください。"
+    parts.append("""💡 **使い方**: 上記の例文を参考に、Issue本文を編集してください。""")
+    parts.append(
+        "類似Issueも確認すると、より詳細な情報が得られます。"
+        if similar_issues
+        else "実際のプロジェクトに合わせて内容を修正してください。"
+    )
 
-    comment += "\n\n<!-- AI-generated comment -->\n"
+    parts.append("\n\n<!-- AI-generated comment -->\n")
 
-    return comment
+    return "".join(parts)
 
 
 def index_all_issues(
@@ -1017,28 +1586,48 @@ def index_all_issues(
     )
     qdrant_client.ensure_collection(vector_size=256)
 
-    # 各Issueをインデックス登録
+    # チャンク分割→Embedding→upsertをサブバッチ単位で融合して処理する。
+    # 全Issueのチャンク・ベクトルを一度にメモリへ載せず、
+    # ピークメモリをサブバッチぶんに抑えたままRTT削減効果を維持する
     success_count = 0
-    for i, issue in enumerate(issues, 1):
-        print(f"[{i}/{len(issues)}] Indexing issue #{issue['number']}...")
+    pending: list[tuple[dict, list[str]]] = []
+    pending_chunk_count = 0
+
+    def flush_pending():
+        nonlocal success_count, pending_chunk_count
+        texts = [chunk for _, chunks in pending for chunk in chunks]
+        vectors = voyage_client.generate_embeddings_batch(texts, dimensions=256)
+
+        items = []
+        offset = 0
+        for issue, chunks in pending:
+            items.append(
+                IssueUpsert(
+                    issue_number=issue["number"],
+                    chunks=chunks,
+                    vectors=vectors[offset : offset + len(chunks)],
+                    title=issue["title"],
+                    state=issue["state"],
+                    url=issue["url"],
+                    labels=issue.get("labels", []),
+                )
+            )
+            offset += len(chunks)
 
-        # チャンク分割
+        qdrant_client.upsert_issue_chunks_bulk(items)
+        success_count += len(items)
+        pending.clear()
+        pending_chunk_count = 0
+
+    for issue in issues:
         chunks = create_issue_chunks(issue["title"], issue["body"])
+        pending.append((issue, chunks))
+        pending_chunk_count += len(chunks)
+        if pending_chunk_count >= VoyageEmbeddingClient.SUB_BATCH_SIZE:
+            flush_pending()
 
-        # 各チャンクのEmbeddingベクトル生成
-        vectors = create_embeddings_for_chunks(chunks, voyage_client, dimensions=256)
-
-        # Qdrantに登録
-        qdrant_client.upsert_issue_chunks(
-            issue_number=issue["number"],
-            chunks=chunks,
-            vectors=vectors,
-            title=issue["title"],
-            state=issue["state"],
-            url=issue["url"],
-            labels=issue.get("labels", []),
-        )
-        success_count += 1
+    if pending:
+        flush_pending()
 
     print("\n=== Indexing Complete ===")
     print(f"Success: {success_count}/{len(issues)} issues")
@@ -1182,8 +1771,8 @@ def main():
             print(f"Found {len(similar_issues)} similar issues")
             for i, sim in enumerate(similar_issues, 1):
                 print(
-                    f"  {i}. #{sim['issue_number']}: {sim['issue_title'][:50]}... "
-                    f"(similarity: {sim['similarity']:.1%})"
+                    f"  {i}. #{sim.issue_number}: {sim.issue_title[:50]}... "
+                    f"(similarity: {sim.similarity:.1%})"
                 )
         else:
             print("No similar issues found")
@@ -1200,7 +1789,7 @@ def main():
     )
 
     # コメント用にフォーマット
-    output = format_comment(improved_content, template_name, similar_issues)
+    output = format_comment(improved_content, template_name, similar_issues, settings)
 
     # --dry-run モードではコンソール出力のみ
     if args.dry_run:
@@ -1216,7 +1805,7 @@ def main():
         print("Error: GITHUB_TOKEN not found")
         sys.exit(1)
 
-    post_comment_via_gh(config.issue_number, output)
+    post_comment(config.issue_number, output)
 
     # RAGインデックス登録（例文生成後）
     if not config.is_rag_enabled: